@@ -0,0 +1,20 @@
+"""
+Numba-compiled kernel for decoding many genes in a single call.
+
+This module requires Numba. gene_decoder.py imports it lazily, the first time a
+batch is decoded, so importing gene_decoder does not load Numba, and falls back to
+NumPy when it is unavailable. The kernel is compiled eagerly from an explicit
+signature (so the first decode does not pay the JIT cost) and the compiled code is
+cached on disk between runs. The single-gene sum kernel lives in _sum_bytes_numba.
+"""
+from numba import njit, prange
+
+
+@njit("void(uint8[::1], int64[::1], int64[::1], int64, int64[::1])", cache=True, parallel=True)
+def _decode_batch(data, starts, lengths, n_options, out):
+    # Each gene is independent, so genes are decoded in parallel.
+    for j in prange(starts.shape[0]):
+        s = 0
+        for i in range(starts[j], starts[j] + lengths[j]):
+            s += data[i]
+        out[j] = s % n_options
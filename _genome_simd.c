@@ -0,0 +1,120 @@
+/*
+ * SIMD byte-sum kernels for gene decoding.
+ *
+ * Exposes sum_bytes(buf), which returns the sum of the byte values of any
+ * C-contiguous buffer (bytes, bytearray, memoryview). The kernel is chosen
+ * once at import time from the instruction sets the CPU supports (AVX-512BW,
+ * then AVX2) on x86-64, and falls back to a scalar loop elsewhere.
+ *
+ * This extension is an opt-in, manual build. The repository has no build
+ * configuration for it, and the compiled module is not checked in (*.so is
+ * gitignored). Until someone builds it, genome.py's import of it fails
+ * silently and gene sums use Numba, NumPy or the builtin sum() instead.
+ *
+ * Build in place, next to genome.py, with:
+ *   cc -O3 -shared -fPIC $(python3-config --includes) _genome_simd.c \
+ *      -o _genome_simd$(python3-config --extension-suffix)
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__))
+#define GENOME_SIMD_X86 1
+#include <immintrin.h>
+#endif
+
+typedef uint64_t (*sum_bytes_fn)(const uint8_t *p, size_t n);
+
+static uint64_t
+sum_bytes_scalar(const uint8_t *p, size_t n)
+{
+    uint64_t s = 0;
+    for (size_t i = 0; i < n; i++) {
+        s += p[i];
+    }
+    return s;
+}
+
+#ifdef GENOME_SIMD_X86
+__attribute__((target("avx2")))
+static uint64_t
+sum_bytes_avx2(const uint8_t *p, size_t n)
+{
+    /* _mm256_sad_epu8 against zero sums each group of 8 bytes into a u64 lane. */
+    const __m256i zero = _mm256_setzero_si256();
+    __m256i acc = _mm256_setzero_si256();
+    size_t i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i chunk = _mm256_loadu_si256((const __m256i *)(p + i));
+        acc = _mm256_add_epi64(acc, _mm256_sad_epu8(chunk, zero));
+    }
+    __m128i lanes = _mm_add_epi64(_mm256_castsi256_si128(acc), _mm256_extracti128_si256(acc, 1));
+    uint64_t s = (uint64_t)_mm_cvtsi128_si64(lanes) + (uint64_t)_mm_extract_epi64(lanes, 1);
+    return s + sum_bytes_scalar(p + i, n - i);
+}
+
+__attribute__((target("avx512f,avx512bw")))
+static uint64_t
+sum_bytes_avx512(const uint8_t *p, size_t n)
+{
+    /* Same reduction as the AVX2 kernel, 64 bytes per load into 8 u64 lanes. */
+    const __m512i zero = _mm512_setzero_si512();
+    __m512i acc = _mm512_setzero_si512();
+    size_t i = 0;
+    for (; i + 64 <= n; i += 64) {
+        __m512i chunk = _mm512_loadu_si512((const void *)(p + i));
+        acc = _mm512_add_epi64(acc, _mm512_sad_epu8(chunk, zero));
+    }
+    uint64_t s = (uint64_t)_mm512_reduce_add_epi64(acc);
+    return s + sum_bytes_scalar(p + i, n - i);
+}
+#endif
+
+static sum_bytes_fn sum_bytes_impl = sum_bytes_scalar;
+
+static PyObject *
+genome_simd_sum_bytes(PyObject *Py_UNUSED(module), PyObject *arg)
+{
+    Py_buffer view;
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0) {
+        return NULL;
+    }
+    uint64_t s = sum_bytes_impl((const uint8_t *)view.buf, (size_t)view.len);
+    PyBuffer_Release(&view);
+    return PyLong_FromUnsignedLongLong(s);
+}
+
+static PyMethodDef genome_simd_methods[] = {
+    {"sum_bytes", genome_simd_sum_bytes, METH_O,
+     "sum_bytes(buf) -> int\n\nReturns the sum of the byte values of a contiguous buffer."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef genome_simd_module = {
+    PyModuleDef_HEAD_INIT,
+    "_genome_simd",
+    "SIMD byte-sum kernels for gene decoding.",
+    -1,
+    genome_simd_methods,
+    NULL, /* m_slots */
+    NULL, /* m_traverse */
+    NULL, /* m_clear */
+    NULL  /* m_free */
+};
+
+PyMODINIT_FUNC
+PyInit__genome_simd(void)
+{
+#ifdef GENOME_SIMD_X86
+    __builtin_cpu_init();
+    /* Prefer the widest kernel the CPU supports. */
+    if (__builtin_cpu_supports("avx512f") && __builtin_cpu_supports("avx512bw")) {
+        sum_bytes_impl = sum_bytes_avx512;
+    }
+    else if (__builtin_cpu_supports("avx2")) {
+        sum_bytes_impl = sum_bytes_avx2;
+    }
+#endif
+    return PyModule_Create(&genome_simd_module);
+}
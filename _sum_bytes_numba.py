@@ -0,0 +1,18 @@
+"""
+Numba-compiled kernel for summing the bytes of one gene.
+
+This module requires Numba. genome.py imports it lazily, the first time a gene long
+enough to use it is summed, and falls back to NumPy / sum() when it is unavailable.
+It is kept apart from _decoders_numba so that loading it does not also load the
+parallel batch kernel. The kernel is compiled eagerly from an explicit signature
+and the compiled code is cached on disk between runs.
+"""
+from numba import njit
+
+
+@njit("int64(uint8[::1])", cache=True)
+def _sum_bytes(buf):
+    s = 0
+    for i in range(buf.shape[0]):
+        s += buf[i]
+    return s
@@ -1,5 +1,30 @@
 from genome import Genome # Assuming genome.py is in the same directory or Python path
 
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; only the batch/population decoders need it
+    np = None
+
+# Numba is optional and slow to import (~0.5s), so the batch kernel is loaded on
+# the first call to decode_simple_attribute_batch; without Numba it falls back to NumPy.
+_NOT_LOADED = object()
+_decode_batch = _NOT_LOADED
+
+
+def _load_decode_batch():
+    global _decode_batch
+    if _decode_batch is _NOT_LOADED:
+        try:
+            from _decoders_numba import _decode_batch
+        except ImportError:
+            _decode_batch = None
+    return _decode_batch
+
+if np is not None:
+    _UINT8 = np.uint8
+    _INT64 = np.int64
+
+
 def decode_simple_attribute(genome: Genome, gene_start: int, gene_length: int, attribute_options: list | tuple) -> str | None:
     """
     Decodes a gene segment to select an attribute from a list of options.
@@ -19,15 +44,11 @@ def decode_simple_attribute(genome: Genome, gene_start: int, gene_length: int, a
         return None
 
     try:
-        gene_bytes = genome.get_gene(gene_start, gene_length)
+        sum_of_bytes = genome.gene_sum(gene_start, gene_length)
     except IndexError:
         # print(f"Error: Could not retrieve gene at start {gene_start} with length {gene_length}.")
         return None
 
-    if not gene_bytes: # Should not happen if get_gene raises IndexError or returns valid bytes
-        return None
-
-    sum_of_bytes = sum(gene_bytes)
     selected_index = sum_of_bytes % len(attribute_options)
     return attribute_options[selected_index]
 
@@ -59,18 +80,12 @@ def decode_interacting_genes(
         return None
 
     try:
-        gene1_bytes = genome.get_gene(gene1_start, gene1_length)
-        gene2_bytes = genome.get_gene(gene2_start, gene2_length)
+        sum_gene1 = genome.gene_sum(gene1_start, gene1_length)
+        sum_gene2 = genome.gene_sum(gene2_start, gene2_length)
     except IndexError:
         # print("Error: Could not retrieve one or both gene segments.")
         return None
 
-    if not gene1_bytes or not gene2_bytes: # Should not happen
-        return None
-
-    sum_gene1 = sum(gene1_bytes)
-    sum_gene2 = sum(gene2_bytes)
-
     # Combine the information. Using multiplication as an example.
     # Ensure sums are not zero if multiplication is used and could lead to all zeros.
     # For this example, we'll proceed directly.
@@ -81,12 +96,124 @@ def decode_interacting_genes(
     return final_value
 
 
+def decode_simple_attribute_batch(genome: Genome, starts, lengths, n_options: int):
+    """
+    Decodes many gene segments of a genome in a single call.
+
+    This is the batch counterpart of decode_simple_attribute: for every gene i, the
+    bytes in [starts[i], starts[i] + lengths[i]) are summed and reduced modulo
+    n_options. Uses the Numba kernel when Numba is installed, otherwise a NumPy
+    prefix-sum. Requires NumPy.
+
+    Args:
+        genome: The Genome object to read from.
+        starts: A sequence of gene start indices.
+        lengths: A sequence of gene lengths, one per start index.
+        n_options: The number of attribute options to select between.
+
+    Returns:
+        An int64 array with the selected option index for each gene, or None if an
+        error occurs (e.g., a gene out of bounds, non-positive n_options).
+    """
+    if np is None:
+        raise ImportError("decode_simple_attribute_batch requires NumPy")
+    if n_options <= 0:
+        return None
+
+    starts = np.ascontiguousarray(starts, dtype=_INT64)
+    lengths = np.ascontiguousarray(lengths, dtype=_INT64)
+    if starts.shape != lengths.shape or starts.ndim != 1:
+        return None
+    # Same bounds rules as Genome.get_gene, checked once for the whole batch
+    if np.any(starts < 0) or np.any(lengths <= 0) or np.any(starts + lengths > len(genome)):
+        return None
+
+    data = genome._nparr # Whole-genome view built once by Genome
+    decode_batch = _load_decode_batch()
+    if decode_batch is not None:
+        out = np.empty(starts.shape[0], dtype=_INT64)
+        decode_batch(data, starts, lengths, n_options, out)
+        return out
+
+    prefix = np.zeros(len(data) + 1, dtype=_INT64)
+    np.cumsum(data, dtype=_INT64, out=prefix[1:])
+    return (prefix[starts + lengths] - prefix[starts]) % n_options
+
+
+def stack_genomes(genomes: list[Genome]):
+    """
+    Stacks equally sized genomes into a single (N, G) uint8 array for decode_population.
+    Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("stack_genomes requires NumPy")
+    return np.stack([genome._nparr for genome in genomes])
+
+
+def _population_gene_sums(genomes, gene_start: int, gene_length: int):
+    if not (0 <= gene_start < genomes.shape[1]) or not (0 < gene_length) or not (gene_start + gene_length <= genomes.shape[1]):
+        return None
+    return genomes[:, gene_start : gene_start + gene_length].sum(axis=1, dtype=_INT64)
+
+
+def decode_population(genomes, gene_specs: dict) -> dict:
+    """
+    Decodes attributes for a whole population of genomes at once.
+
+    Each gene is summed for every genome in one vectorized reduction over the
+    stacked population, instead of one Python-level decode per genome.
+    Requires NumPy.
+
+    Args:
+        genomes: A (N, G) uint8 array with one genome per row (see stack_genomes).
+        gene_specs: Maps attribute names to gene specifications, either
+                    ('simple', gene_start, gene_length, attribute_options) or
+                    ('interacting', gene1_start, gene1_length, gene2_start, gene2_length, max_value),
+                    mirroring the arguments of decode_simple_attribute and
+                    decode_interacting_genes.
+
+    Returns:
+        A dict mapping each attribute name to an array of N decoded values, or to
+        None if that attribute could not be decoded (e.g., invalid gene segment,
+        empty attribute_options, non-positive max_value).
+    """
+    if np is None:
+        raise ImportError("decode_population requires NumPy")
+    genomes = np.asarray(genomes, dtype=_UINT8)
+    if genomes.ndim != 2:
+        raise ValueError("genomes must be a 2-D array with one genome per row")
+
+    results = {}
+    for name, spec in gene_specs.items():
+        kind, *args = spec
+        if kind == 'simple':
+            gene_start, gene_length, attribute_options = args
+            sums = _population_gene_sums(genomes, gene_start, gene_length)
+            if sums is None or len(attribute_options) == 0:
+                results[name] = None
+                continue
+            # No copy is made when the options are already an object array
+            options = np.asarray(attribute_options, dtype=object)
+            results[name] = options[sums % len(options)]
+        elif kind == 'interacting':
+            gene1_start, gene1_length, gene2_start, gene2_length, max_value = args
+            sums1 = _population_gene_sums(genomes, gene1_start, gene1_length)
+            sums2 = _population_gene_sums(genomes, gene2_start, gene2_length)
+            if sums1 is None or sums2 is None or max_value <= 0:
+                results[name] = None
+                continue
+            # Reducing before multiplying gives the same result without int64 overflow
+            results[name] = (sums1 % max_value) * (sums2 % max_value) % max_value
+        else:
+            raise ValueError(f"Unknown gene spec kind: {kind!r}")
+    return results
+
+
 if __name__ == '__main__':
     # Example Usage
     print("Setting up a test genome...")
     # Create a predictable genome for testing
-    test_data_list = [i for i in range(256)] * 4 # 1024 bytes, repeating 0-255 sequence
-    test_data = bytes(test_data_list)
+    test_data = bytes(range(256)) * 4 # 1024 bytes, repeating 0-255 sequence
     test_genome = Genome(data=test_data)
     print(f"Test genome length: {len(test_genome)}")
 
@@ -175,9 +302,6 @@ if __name__ == '__main__':
         print(f"Error with zero-length genome test: {e}")
 
 
-    # Test case: genome.get_gene returns a gene of length less than requested (not possible with current get_gene)
-    # or if gene_bytes is empty for some reason (also not likely with current get_gene)
-    # This is mostly defensive coding in the decoders.
     print("\nTesting decode_simple_attribute with a gene that is valid but all zeros (sum=0)")
     # Gene: bytes at 256, 257, 258. test_data[256] = 0, test_data[257]=1, test_data[258]=2
     # If we took a gene of all 0s (e.g. by mutating the genome).
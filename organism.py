@@ -1,12 +1,59 @@
 from genome import Genome
-from gene_decoder import decode_simple_attribute, decode_interacting_genes
+from gene_decoder import decode_population
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; only decode_population needs it
+    np = None
+
+# Class variables that make up an Organism's gene layout
+_LAYOUT_ATTRS = frozenset({
+    'COLOR_GENE_START', 'COLOR_GENE_LENGTH', 'COLOR_OPTIONS',
+    'SIZE_GENE1_START', 'SIZE_GENE1_LENGTH',
+    'SIZE_GENE2_START', 'SIZE_GENE2_LENGTH',
+    'SIZE_MAX_VALUE', 'MIN_GENOME_SIZE',
+})
+
+
+def _respecialize_and_decode(self):
+    # Stands in for a generated decoder invalidated by a layout change (see
+    # _OrganismMeta); regenerates it for the current layout, then decodes.
+    type(self)._specialize()
+    self._decode_specialized()
+
+
+class _OrganismMeta(type):
+    # Reassigning (or deleting) a layout class variable invalidates the decoders
+    # generated for the class and all its subclasses, which inherit the value unless
+    # they override it. They are regenerated on next use. Mutating a list of options
+    # in place is not detected; assign a new sequence instead.
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name in _LAYOUT_ATTRS:
+            cls._invalidate_specialized()
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        if name in _LAYOUT_ATTRS:
+            cls._invalidate_specialized()
+
+    def _invalidate_specialized(cls):
+        pending = [cls]
+        while pending:
+            klass = pending.pop()
+            type.__setattr__(klass, '_decode_specialized', _respecialize_and_decode)
+            pending.extend(klass.__subclasses__())
+
+
+class Organism(metaclass=_OrganismMeta):
+    # Decoded attributes are stored in slots rather than a per-instance dict
+    __slots__ = ('genome', 'color', 'size')
 
-class Organism:
     # Predefined gene locations and options for demonstration
     # These could be made more flexible (e.g., passed to constructor or class variables)
     COLOR_GENE_START = 0
     COLOR_GENE_LENGTH = 4
-    COLOR_OPTIONS = ['red', 'green', 'blue', 'yellow', 'purple', 'orange', 'pink', 'brown', 'black', 'white']
+    COLOR_OPTIONS = ('red', 'green', 'blue', 'yellow', 'purple', 'orange', 'pink', 'brown', 'black', 'white')
 
     SIZE_GENE1_START = COLOR_GENE_START + COLOR_GENE_LENGTH # Ensure no overlap, start after color gene
     SIZE_GENE1_LENGTH = 2
@@ -18,7 +65,10 @@ class Organism:
     MIN_GENOME_SIZE = SIZE_GENE2_START + SIZE_GENE2_LENGTH
 
     def __init__(self, genome_size: int = 1024, genome_instance: Genome | None = None):
-        if genome_instance is not None and isinstance(genome_instance, Genome):
+        if isinstance(genome_instance, Genome):
+            # The only bounds check on the decode path: with the layout checked against
+            # MIN_GENOME_SIZE when the decoder is generated, every gene is in range, so
+            # _decode_specialized indexes the genome without checks or try/except.
             if len(genome_instance) < self.MIN_GENOME_SIZE:
                 raise ValueError(
                     f"Provided genome is too small ({len(genome_instance)} bytes). "
@@ -34,47 +84,162 @@ class Organism:
                 genome_size = self.MIN_GENOME_SIZE
             self.genome = Genome(size=genome_size)
 
-        self.attributes = {}
         self.decode_attributes()
 
     def decode_attributes(self):
         """
         Decodes the organism's genome to populate its attributes.
         """
-        # Decode 'color'
-        self.attributes['color'] = decode_simple_attribute(
-            self.genome,
-            self.COLOR_GENE_START,
-            self.COLOR_GENE_LENGTH,
-            self.COLOR_OPTIONS
-        )
+        # Runs the decoder generated for the class's current gene layout (see
+        # _build_specialized_decoder). It is per class, so subclasses that override
+        # decode_attributes and call super() still decode with their own layout.
+        self._decode_specialized()
+
+    # Genes longer than this are summed with a slice instead of unrolled indexing
+    _MAX_UNROLLED_GENE_LENGTH = 16
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Specialize eagerly so an invalid layout is reported when the class is defined
+        cls._specialize()
+
+    @classmethod
+    def _specialize(cls) -> None:
+        """
+        Rebuilds the option tables and the generated decoder for the class's current
+        gene layout.
+        """
+        cls._build_option_tables()
+        cls._build_specialized_decoder()
+
+    @classmethod
+    def _build_option_tables(cls) -> None:
+        """
+        Precomputes lookup tables derived from COLOR_OPTIONS: an immutable tuple with
+        its length, and an object array so decode_population can select every
+        organism's option with one fancy-indexing operation.
+        """
+        cls._COLOR_OPTIONS = tuple(cls.COLOR_OPTIONS)
+        cls._COLOR_OPTIONS_LEN = len(cls._COLOR_OPTIONS)
+        cls._COLOR_OPTIONS_NPARR = np.array(cls._COLOR_OPTIONS, dtype=object) if np is not None else None
+
+    @classmethod
+    def _build_specialized_decoder(cls) -> None:
+        """
+        Generates _decode_specialized, the decoder for this class's gene layout.
 
-        # Decode 'size'
-        self.attributes['size'] = decode_interacting_genes(
-            self.genome,
-            self.SIZE_GENE1_START,
-            self.SIZE_GENE1_LENGTH,
-            self.SIZE_GENE2_START,
-            self.SIZE_GENE2_LENGTH,
-            self.SIZE_MAX_VALUE
+        Gene positions, option counts and SIZE_MAX_VALUE are folded into the generated
+        source as constants, so decoding is a straight-line sequence of byte reads and
+        arithmetic with no calls into gene_decoder, which give the same results. Bounds checks are unnecessary because
+        __init__ guarantees the genome holds at least MIN_GENOME_SIZE bytes, and the
+        layout is checked here to fit within MIN_GENOME_SIZE.
+
+        The generated code reads bytes directly and does not go through Genome.gene_sum,
+        so Organism decoding neither uses nor fills the genome's gene-sum cache. Summing
+        a few bytes inline is cheaper than a gene_sum call even when it hits the cache.
+
+        Raises:
+            ValueError: If a gene extends past MIN_GENOME_SIZE (e.g. a subclass moved a
+                        gene without raising MIN_GENOME_SIZE to match).
+        """
+        genes = {
+            'COLOR_GENE': (cls.COLOR_GENE_START, cls.COLOR_GENE_LENGTH),
+            'SIZE_GENE1': (cls.SIZE_GENE1_START, cls.SIZE_GENE1_LENGTH),
+            'SIZE_GENE2': (cls.SIZE_GENE2_START, cls.SIZE_GENE2_LENGTH),
+        }
+        for name, (start, length) in genes.items():
+            if start + length > cls.MIN_GENOME_SIZE:
+                raise ValueError(
+                    f"{cls.__name__}.{name} ends at byte {start + length}, past "
+                    f"MIN_GENOME_SIZE ({cls.MIN_GENOME_SIZE}). Raise MIN_GENOME_SIZE to cover the gene layout."
+                )
+
+        def is_valid_gene(start: int, length: int) -> bool:
+            # Same rule as Genome.get_gene; the end is already checked above
+            return start >= 0 and length > 0
+
+        def byte_sum(start: int, length: int) -> str:
+            if length > cls._MAX_UNROLLED_GENE_LENGTH:
+                return f"sum(d[{start}:{start + length}])"
+            return " + ".join(f"d[{i}]" for i in range(start, start + length))
+
+        # Decode 'color' (decode_simple_attribute)
+        if cls._COLOR_OPTIONS_LEN and is_valid_gene(cls.COLOR_GENE_START, cls.COLOR_GENE_LENGTH):
+            color_expr = f"_COLOR_OPTIONS[({byte_sum(cls.COLOR_GENE_START, cls.COLOR_GENE_LENGTH)}) % {cls._COLOR_OPTIONS_LEN}]"
+        else:
+            color_expr = "None" # Same result as decode_simple_attribute with no options or an invalid gene
+        # Decode 'size' (decode_interacting_genes)
+        if (cls.SIZE_MAX_VALUE > 0
+                and is_valid_gene(cls.SIZE_GENE1_START, cls.SIZE_GENE1_LENGTH)
+                and is_valid_gene(cls.SIZE_GENE2_START, cls.SIZE_GENE2_LENGTH)):
+            size_expr = (
+                f"(({byte_sum(cls.SIZE_GENE1_START, cls.SIZE_GENE1_LENGTH)})"
+                f" * ({byte_sum(cls.SIZE_GENE2_START, cls.SIZE_GENE2_LENGTH)})) % {cls.SIZE_MAX_VALUE}"
+            )
+        else:
+            size_expr = "None" # Same result as decode_interacting_genes with max_value <= 0 or an invalid gene
+
+        # Add more attribute decoding here as needed: build an expression for it like
+        # the ones above and assign it below, list its class variables in
+        # _LAYOUT_ATTRS, and add the attribute to __slots__, the attributes property
+        # and decode_population.
+        source = (
+            "def _decode_specialized(self):\n"
+            "    d = self.genome.data\n"
+            f"    self.color = {color_expr}\n"
+            f"    self.size = {size_expr}\n"
         )
+        namespace = {'_COLOR_OPTIONS': cls._COLOR_OPTIONS}
+        exec(source, namespace)
+        decoder = namespace['_decode_specialized']
+        decoder.__qualname__ = f"{cls.__qualname__}._decode_specialized"
+        cls._decode_specialized = decoder
 
-        # Add more attribute decoding here as needed
+    @classmethod
+    def decode_population(cls, genomes) -> dict:
+        """
+        Decodes the attributes for a whole population of genomes in one vectorized pass.
+
+        Args:
+            genomes: A (N, G) uint8 array with one genome per row (see
+                     gene_decoder.stack_genomes), where G >= MIN_GENOME_SIZE.
+
+        Returns:
+            A dict mapping each attribute name to an array of N decoded values.
+        """
+        if cls._decode_specialized is _respecialize_and_decode:
+            cls._specialize() # The layout changed; refresh _COLOR_OPTIONS_NPARR
+        return decode_population(genomes, {
+            'color': ('simple', cls.COLOR_GENE_START, cls.COLOR_GENE_LENGTH, cls._COLOR_OPTIONS_NPARR),
+            'size': ('interacting',
+                     cls.SIZE_GENE1_START, cls.SIZE_GENE1_LENGTH,
+                     cls.SIZE_GENE2_START, cls.SIZE_GENE2_LENGTH,
+                     cls.SIZE_MAX_VALUE),
+        })
+
+    @property
+    def attributes(self) -> dict:
+        """
+        The decoded attributes as a dict, built on demand from the attribute slots.
+        """
+        return {'color': self.color, 'size': self.size}
 
     def display_attributes(self) -> None:
         """
         Prints the organism's attributes in a readable format.
         """
         print("Organism Attributes:")
-        if not self.attributes:
-            print("  No attributes decoded.")
-            return
         for key, value in self.attributes.items():
             print(f"  {key.capitalize()}: {value if value is not None else 'N/A'}")
 
     def __str__(self) -> str:
-        genome_str_preview = str(self.genome)[:32] + "..." if len(str(self.genome)) > 32 else str(self.genome)
-        return f"Organism(Genome: {genome_str_preview}, Attributes: {self.attributes})"
+        # Hex-encode only the 16 bytes shown (32 hex chars), not the whole genome
+        raw = self.genome.data
+        preview = raw[:16].hex()
+        suffix = "..." if len(raw) > 16 else ""
+        return f"Organism(Genome: {preview}{suffix}, Attributes: {self.attributes})"
+
+Organism._specialize()
 
 if __name__ == '__main__':
     print("Creating a new organism with default genome size (1024)...")
@@ -123,14 +288,13 @@ if __name__ == '__main__':
     # Original org3: Color: pink (idx 6), Size: 61
     # Mutate the first byte (part of color gene) to a large value.
     # e.g., data[0] = 255. Color gene: 255,1,2,3. Sum = 261. 261 % 10 = 1 (green)
-    if org3.genome:
-        org3.genome.mutate_byte(0, 255) # Mutate first byte
-        print(f"Mutated genome for org3 (first byte to 255): {str(org3.genome)[:32]}...")
-        org3.decode_attributes() # Re-decode attributes
-        print("After mutation and re-decoding:")
-        print(org3)
-        org3.display_attributes()
-        # Expected: Color: green, Size: 61 (size genes unchanged)
+    org3.genome.mutate_byte(0, 255) # Mutate first byte
+    print(f"Mutated genome for org3 (first byte to 255): {org3.genome.data[:16].hex()}...")
+    org3.decode_attributes() # Re-decode attributes
+    print("After mutation and re-decoding:")
+    print(org3)
+    org3.display_attributes()
+    # Expected: Color: green, Size: 61 (size genes unchanged)
 
     print("\nOrganism with default random genome (attributes will vary):")
     org_random = Organism(genome_size=Organism.MIN_GENOME_SIZE)
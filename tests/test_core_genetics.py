@@ -2,15 +2,28 @@ import sys
 import os
 import unittest
 import io
+import copy
+import pickle
 from contextlib import redirect_stdout
+from unittest import mock
 
 # Adjust sys.path to include the parent directory (root of the project)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import genome
 from genome import Genome
-from gene_decoder import decode_simple_attribute, decode_interacting_genes
+import gene_decoder
+from gene_decoder import (
+    decode_simple_attribute, decode_interacting_genes, decode_simple_attribute_batch,
+    decode_population, stack_genomes,
+)
 from organism import Organism
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class TestCoreGenetics(unittest.TestCase):
 
     # --- Genome Tests ---
@@ -28,6 +41,21 @@ class TestCoreGenetics(unittest.TestCase):
         self.assertEqual(g.data, data)
         self.assertEqual(len(g), len(data))
 
+    def test_genome_create_batch_secure(self):
+        genomes = Genome.create_batch(3, size=32, secure=True)
+        self.assertEqual([len(g) for g in genomes], [32, 32, 32])
+
+    def test_genome_create_batch(self):
+        genomes = Genome.create_batch(5, size=16)
+        self.assertEqual(len(genomes), 5)
+        self.assertTrue(all(len(g) == 16 for g in genomes))
+        before = [bytes(g.data) for g in genomes[1:]]
+        genomes[0].mutate_byte(index=0, new_byte_value=genomes[0].data[0] ^ 0xFF)
+        self.assertEqual([bytes(g.data) for g in genomes[1:]], before) # Independent storage
+        self.assertEqual(Genome.create_batch(0, size=16), [])
+        with self.assertRaises(ValueError):
+            Genome.create_batch(3, size=-1)
+
     def test_genome_creation_negative_size_error(self):
         with self.assertRaises(ValueError):
             Genome(size=-10)
@@ -38,6 +66,13 @@ class TestCoreGenetics(unittest.TestCase):
         self.assertEqual(g.get_gene(start_index=2, length=4), b'\x02\x03\x04\x05')
         self.assertEqual(g.get_gene(start_index=0, length=len(data)), data) # Whole genome
 
+    def test_get_gene_returns_view(self):
+        data = b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09'
+        g = Genome(data=data)
+        gene = g.get_gene(start_index=2, length=4)
+        self.assertIsInstance(gene, memoryview) # Zero-copy view, not a new bytes object
+        self.assertEqual(gene.hex(), '02030405')
+
     def test_get_gene_out_of_bounds(self):
         data = b'\x00\x01\x02\x03\x04'
         g = Genome(data=data)
@@ -65,6 +100,63 @@ class TestCoreGenetics(unittest.TestCase):
         self.assertEqual(g.data[5], 0xAB)
         self.assertEqual(len(g.data), 10)
 
+    def test_mutate_byte_in_place(self):
+        data = b'\x00\x01\x02\x03'
+        g = Genome(data=data)
+        gene = g.get_gene(start_index=0, length=4)
+        g.mutate_byte(index=1, new_byte_value=0xFF)
+        self.assertEqual(gene[1], 0xFF) # Existing views see the in-place mutation
+        self.assertEqual(data, b'\x00\x01\x02\x03') # Caller's data is not modified
+
+    def test_gene_sum_cached_and_updated_on_mutation(self):
+        g = Genome(data=bytes(range(16)))
+        self.assertEqual(g.gene_sum(0, 4), 6)
+        self.assertEqual(g.gene_sum(2, 8), sum(range(2, 10)))
+        g.mutate_byte(index=3, new_byte_value=100) # Covered by both genes
+        g.mutate_byte(index=12, new_byte_value=0) # Covered by neither
+        self.assertEqual(g.gene_sum(0, 4), sum(g.data[0:4]))
+        self.assertEqual(g.gene_sum(2, 8), sum(g.data[2:10]))
+        self.assertEqual(g.gene_sum(10, 6), sum(g.data[10:16]))
+        with self.assertRaises(IndexError):
+            g.gene_sum(14, 4)
+
+    def test_genome_pickle_and_deepcopy_round_trip(self):
+        g = Genome(size=100)
+        g.gene_sum(0, 10)
+        for clone in (pickle.loads(pickle.dumps(g)), copy.deepcopy(g)):
+            self.assertEqual(clone.to_hex(), g.to_hex())
+            self.assertEqual(clone._gene_sum_cache, {})
+            self.assertEqual(clone.gene_sum(0, 10), g.gene_sum(0, 10))
+            self.assertTrue(clone.data.readonly)
+            clone.mutate_byte(0, (g.data[0] + 1) % 256) # Copies do not share bytes
+            self.assertNotEqual(clone.data[0], g.data[0])
+
+    def test_organism_pickle_and_deepcopy_round_trip(self):
+        org = Organism(genome_size=64)
+        for clone in (pickle.loads(pickle.dumps(org)), copy.deepcopy(org)):
+            self.assertEqual(clone.attributes, org.attributes)
+            self.assertEqual(clone.genome.to_hex(), org.genome.to_hex())
+            self.assertIsNot(clone.genome, org.genome)
+
+    def test_genome_data_read_only(self):
+        g = Genome(data=bytes(range(16)))
+        self.assertEqual(g.gene_sum(0, 4), 6)
+        with self.assertRaises(TypeError):
+            g.data[0] = 9 # Would bypass the gene-sum cache
+        with self.assertRaises(TypeError):
+            g.get_gene(0, 4)[0] = 9
+        with self.assertRaises(AttributeError):
+            g.data = bytearray(16)
+        self.assertEqual(g.gene_sum(0, 4), 6)
+
+    def test_gene_sum_cache_bounded(self):
+        g = Genome(data=bytes(range(200)))
+        for start in range(150):
+            self.assertEqual(g.gene_sum(start, 4), sum(range(start, start + 4)))
+        self.assertEqual(len(g._gene_sum_cache), genome._GENE_SUM_CACHE_MAX)
+        g.mutate_byte(index=140, new_byte_value=0) # Only uncached genes cover this byte
+        self.assertEqual(g.gene_sum(138, 4), 138 + 139 + 0 + 141)
+
     def test_mutate_byte_invalid_index(self):
         g = Genome(size=10)
         with self.assertRaises(IndexError):
@@ -82,7 +174,15 @@ class TestCoreGenetics(unittest.TestCase):
     def test_genome_str_representation(self):
         data = b'\x01\x02\x03\x04'
         g = Genome(data=data)
-        self.assertEqual(str(g), data.hex())
+        self.assertEqual(g.to_hex(), data.hex())
+        self.assertEqual(str(g), f"Genome(len=4, head={data.hex()})")
+
+    def test_genome_str_truncated(self):
+        data = bytes(range(100))
+        g = Genome(data=data)
+        self.assertEqual(str(g), f"Genome(len=100, head={data[:16].hex()})")
+        self.assertEqual(repr(g), str(g))
+        self.assertEqual(g.to_hex(), data.hex())
 
     # --- Gene Decoder Tests ---
     def test_decode_simple_attribute_valid(self):
@@ -94,6 +194,26 @@ class TestCoreGenetics(unittest.TestCase):
         decoded_color = decode_simple_attribute(g, gene_start=0, gene_length=4, attribute_options=colors)
         self.assertEqual(decoded_color, "green")
 
+    def test_decode_simple_attribute_long_gene(self):
+        # Long genes take the vectorized summation path when NumPy is available
+        data = bytes(range(256)) * 4
+        g = Genome(data=data)
+        options = list(range(7))
+        decoded = decode_simple_attribute(g, gene_start=3, gene_length=1000, attribute_options=options)
+        self.assertEqual(decoded, sum(data[3:1003]) % 7)
+        # Fresh genomes, so the sums are not served from the gene-sum cache
+        with mock.patch.object(genome, '_simd_sum_bytes', None): # Numba / NumPy paths
+            self.assertEqual(Genome(data=data).gene_sum(3, 1000), sum(data[3:1003]))
+            with mock.patch.object(genome, '_numba_sum_bytes', None): # NumPy-only path
+                self.assertEqual(Genome(data=data).gene_sum(3, 1000), sum(data[3:1003]))
+
+    @unittest.skipIf(genome._simd_sum_bytes is None, "_genome_simd extension is not built")
+    def test_simd_sum_bytes(self):
+        data = bytearray(range(256)) * 4
+        for start, length in [(0, 0), (0, 1), (3, 31), (5, 32), (7, 33), (2, 63), (4, 64), (6, 65), (1, 1000), (0, 1024)]:
+            view = memoryview(data)[start:start + length]
+            self.assertEqual(genome._simd_sum_bytes(view), sum(view))
+
     def test_decode_simple_attribute_empty_options(self):
         g = Genome(size=10)
         decoded_attr = decode_simple_attribute(g, 0, 4, [])
@@ -122,6 +242,60 @@ class TestCoreGenetics(unittest.TestCase):
         g = Genome(size=3) # gene2_start=2, gene2_length=2 is out of bounds
         self.assertIsNone(decode_interacting_genes(g, 0, 2, 2, 2, max_value=10))
 
+    def test_failed_decodes_do_not_enter_gene_sum_cache(self):
+        g = Genome(data=bytes(range(10)))
+        colors = ["red", "green", "blue"]
+        self.assertIsNone(decode_simple_attribute(g, 8, 5, colors))
+        self.assertIsNone(decode_interacting_genes(g, -2, 4, 0, 2, 10))
+        self.assertNotIn((8, 5), g._gene_sum_cache)
+        self.assertNotIn((-2, 4), g._gene_sum_cache)
+        with self.assertRaises(IndexError):
+            g.gene_sum(8, 5)
+        with self.assertRaises(IndexError):
+            g.gene_sum(-2, 4)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_decode_simple_attribute_batch(self):
+        data = bytes(range(256)) * 4
+        g = Genome(data=data)
+        starts, lengths = [0, 10, 250, 1000], [10, 5, 10, 24]
+        expected = [sum(data[s:s + l]) % 7 for s, l in zip(starts, lengths)]
+        self.assertEqual(decode_simple_attribute_batch(g, starts, lengths, 7).tolist(), expected)
+        # The NumPy fallback used when Numba is unavailable gives the same result
+        with mock.patch.object(gene_decoder, '_decode_batch', None):
+            self.assertEqual(decode_simple_attribute_batch(g, starts, lengths, 7).tolist(), expected)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_decode_simple_attribute_batch_invalid(self):
+        g = Genome(size=10)
+        self.assertIsNone(decode_simple_attribute_batch(g, [0, 8], [4, 4], 5)) # Second gene out of bounds
+        self.assertIsNone(decode_simple_attribute_batch(g, [0], [0], 5)) # Zero length
+        self.assertIsNone(decode_simple_attribute_batch(g, [0], [4], 0)) # No options
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_decode_population_matches_single_decoders(self):
+        genomes = [Genome(size=64) for _ in range(20)]
+        colors = ["red", "green", "blue", "yellow", "purple"]
+        decoded = decode_population(stack_genomes(genomes), {
+            'color': ('simple', 3, 10, colors),
+            'size': ('interacting', 0, 4, 40, 24, 97),
+        })
+        for i, g in enumerate(genomes):
+            self.assertEqual(decoded['color'][i], decode_simple_attribute(g, 3, 10, colors))
+            self.assertEqual(decoded['size'][i], decode_interacting_genes(g, 0, 4, 40, 24, 97))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_decode_population_invalid_specs(self):
+        population = stack_genomes([Genome(size=10) for _ in range(3)])
+        decoded = decode_population(population, {
+            'out_of_bounds': ('simple', 8, 4, ["a", "b"]),
+            'no_options': ('simple', 0, 4, []),
+            'bad_max': ('interacting', 0, 2, 2, 2, 0),
+        })
+        self.assertEqual(decoded, {'out_of_bounds': None, 'no_options': None, 'bad_max': None})
+        with self.assertRaises(ValueError):
+            decode_population(population, {'x': ('unknown', 0, 1)})
+
     # --- Organism Tests ---
     def test_organism_creation_default_genome(self):
         org = Organism()
@@ -151,6 +325,13 @@ class TestCoreGenetics(unittest.TestCase):
         self.assertEqual(org.attributes.get('color'), Organism.COLOR_OPTIONS[6]) # 'pink'
         self.assertEqual(org.attributes.get('size'), 61)
 
+    def test_organism_attributes_stored_in_slots(self):
+        org = Organism(genome_instance=Genome(data=bytes([0,1,2,3, 10,11, 20,21])))
+        self.assertFalse(hasattr(org, '__dict__'))
+        self.assertEqual(org.color, 'pink')
+        self.assertEqual(org.size, 61)
+        self.assertEqual(org.attributes, {'color': 'pink', 'size': 61})
+
     def test_organism_creation_genome_size_too_small_for_attributes(self):
         # Organism constructor adjusts size up if genome_size < MIN_GENOME_SIZE
         org = Organism(genome_size=4) # MIN_GENOME_SIZE is 8
@@ -186,5 +367,118 @@ class TestCoreGenetics(unittest.TestCase):
         self.assertIn("'color':", org_str)
         self.assertIn("'size':", org_str)
 
+    def test_organism_str_genome_preview(self):
+        data = bytes(range(40))
+        org = Organism(genome_instance=Genome(data=data))
+        self.assertIn(f"Genome: {data[:16].hex()}...,", str(org)) # Truncated to 16 bytes
+        short = Organism(genome_instance=Genome(data=data[:Organism.MIN_GENOME_SIZE]))
+        self.assertIn(f"Genome: {data[:Organism.MIN_GENOME_SIZE].hex()},", str(short))
+
+    def test_organism_specialized_decoder_matches_decoders(self):
+        for _ in range(50):
+            org = Organism(genome_size=Organism.MIN_GENOME_SIZE)
+            self.assertEqual(org.color, decode_simple_attribute(org.genome, 0, 4, Organism.COLOR_OPTIONS))
+            self.assertEqual(org.size, decode_interacting_genes(org.genome, 4, 2, 6, 2, 100))
+
+    def test_organism_subclass_gets_own_specialized_decoder(self):
+        class LongGeneOrganism(Organism):
+            COLOR_GENE_LENGTH = 40 # Long enough to be summed with a slice
+            COLOR_OPTIONS = ['cyan', 'magenta', 'teal']
+            SIZE_GENE1_START = 40
+            SIZE_GENE2_START = 42
+            SIZE_MAX_VALUE = 7
+            MIN_GENOME_SIZE = 44
+
+        data = bytes(range(44))
+        org = LongGeneOrganism(genome_instance=Genome(data=data))
+        self.assertEqual(org.attributes['color'], ['cyan', 'magenta', 'teal'][sum(data[0:40]) % 3])
+        self.assertEqual(org.attributes['size'], (sum(data[40:42]) * sum(data[42:44])) % 7)
+        self.assertEqual(LongGeneOrganism._COLOR_OPTIONS, ('cyan', 'magenta', 'teal'))
+        self.assertEqual(LongGeneOrganism._COLOR_OPTIONS_LEN, 3)
+        # The base class keeps its own layout
+        base = Organism(genome_instance=Genome(data=bytes([0,1,2,3, 10,11, 20,21])))
+        self.assertEqual(base.attributes, {'color': 'pink', 'size': 61})
+        self.assertEqual(Organism._COLOR_OPTIONS_LEN, 10)
+
+    def test_organism_subclass_overriding_decode_attributes_uses_own_layout(self):
+        class ExtendedOrganism(Organism):
+            COLOR_GENE_START = 4
+            COLOR_GENE_LENGTH = 2
+            SIZE_GENE1_START = 0
+
+            def decode_attributes(self):
+                super().decode_attributes()
+                self.color = self.color.upper()
+
+        data = bytes([0,1,2,3, 10,11, 20,21])
+        org = ExtendedOrganism(genome_instance=Genome(data=data))
+        g = Genome(data=data)
+        self.assertEqual(org.color, decode_simple_attribute(g, 4, 2, Organism.COLOR_OPTIONS).upper())
+        self.assertEqual(org.size, decode_interacting_genes(g, 0, 2, 6, 2, 100))
+
+    def test_organism_layout_changes_at_runtime_are_decoded(self):
+        class RuntimeOrganism(Organism):
+            pass
+
+        data = bytes([0,1,2,3, 10,11, 20,21])
+        self.assertEqual(RuntimeOrganism(genome_instance=Genome(data=data)).attributes, {'color': 'pink', 'size': 61})
+        try:
+            Organism.SIZE_MAX_VALUE = 7 # Inherited by RuntimeOrganism
+            RuntimeOrganism.COLOR_OPTIONS = ['cyan', 'magenta', 'teal', 'lime']
+            self.assertEqual(Organism(genome_instance=Genome(data=data)).size, 861 % 7)
+            org = RuntimeOrganism(genome_instance=Genome(data=data))
+            self.assertEqual(org.attributes, {'color': 'teal', 'size': 861 % 7})
+            with self.assertRaises(ValueError):
+                RuntimeOrganism.SIZE_GENE2_START = 20 # Past MIN_GENOME_SIZE
+                org.decode_attributes()
+        finally:
+            Organism.SIZE_MAX_VALUE = 100
+        self.assertEqual(Organism(genome_instance=Genome(data=data)).attributes, {'color': 'pink', 'size': 61})
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_organism_decode_population_uses_current_layout(self):
+        class RuntimeOrganism(Organism):
+            pass
+
+        genomes = [Genome(data=bytes([0,1,2,3, 10,11, 20,21]))]
+        RuntimeOrganism.decode_population(stack_genomes(genomes))
+        RuntimeOrganism.COLOR_OPTIONS = ('cyan', 'magenta', 'teal', 'lime')
+        decoded = RuntimeOrganism.decode_population(stack_genomes(genomes))
+        self.assertEqual(list(decoded['color']), ['teal'])
+
+    def test_organism_decode_does_not_touch_gene_sum_cache(self):
+        g = Genome(data=bytes(range(Organism.MIN_GENOME_SIZE)))
+        org = Organism(genome_instance=g)
+        org.decode_attributes()
+        self.assertEqual(g._gene_sum_cache, {}) # Decoded by direct indexing, not gene_sum
+
+    def test_organism_subclass_layout_must_fit_min_genome_size(self):
+        with self.assertRaises(ValueError):
+            class MovedGeneOrganism(Organism):
+                SIZE_GENE2_START = 20 # MIN_GENOME_SIZE left at 8
+
+        class FittedGeneOrganism(Organism):
+            SIZE_GENE2_START = 20
+            MIN_GENOME_SIZE = 22
+
+        data = bytes(range(22))
+        org = FittedGeneOrganism(genome_instance=Genome(data=data))
+        self.assertEqual(org.size, decode_interacting_genes(Genome(data=data), 4, 2, 20, 2, 100))
+
+    def test_organism_subclass_invalid_gene_decodes_to_none(self):
+        class NegativeGeneOrganism(Organism):
+            COLOR_GENE_START = -2 # Invalid for get_gene, so decoded as None like the decoders do
+
+        org = NegativeGeneOrganism(genome_size=Organism.MIN_GENOME_SIZE)
+        self.assertIsNone(org.color)
+        self.assertIsNotNone(org.size)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_organism_decode_population(self):
+        organisms = [Organism(genome_size=32) for _ in range(10)]
+        decoded = Organism.decode_population(stack_genomes([org.genome for org in organisms]))
+        self.assertEqual(list(decoded['color']), [org.attributes['color'] for org in organisms])
+        self.assertEqual(list(decoded['size']), [org.attributes['size'] for org in organisms])
+
 if __name__ == '__main__':
     unittest.main()